@@ -7,21 +7,55 @@ Enhanced MQ-135 Gas Sensor Monitor with Voice Alerts and System Health Monitorin
 - Comprehensive error handling with voice feedback
 """
 
+# eventlet must patch the stdlib before anything else imports it, so that
+# sockets, subprocesses, threads and sleeps all cooperate with its reactor.
+# One reactor then serves every polling/websocket client instead of a
+# GIL-bound thread per request under the Werkzeug dev server.
+try:
+    import eventlet
+    eventlet.monkey_patch()
+    import eventlet.tpool
+    import eventlet.wsgi
+except ImportError:
+    eventlet = None
+
 import RPi.GPIO as GPIO
+import ctypes
+import fcntl
+import glob
+import hashlib
 import time
 import threading
 import logging
+import shutil
 import signal
 import sys
 import os
+import select
 import subprocess
 import json
+import queue
+import wave
 from datetime import datetime
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, Response
 from flask_socketio import SocketIO, emit
 import cv2
 import base64
 
+# pydbus lets us query BlueZ/systemd over D-Bus without forking helper
+# processes - fall back to the CLI tools if it isn't installed
+try:
+    import pydbus
+except ImportError:
+    pydbus = None
+
+# orjson serializes in C (~5x faster than stdlib json) - worth it for the
+# polled /api/status endpoint; fall back to Flask's jsonify without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration
 GAS_SENSOR_PIN = 17
 DEBOUNCE_TIME = 2.0
@@ -30,7 +64,8 @@ ALERT_REPEAT_INTERVAL = 10.0
 # Flask and SocketIO setup
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'gas_sensor_secret'
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, async_mode='eventlet' if eventlet else 'threading',
+                    cors_allowed_origins="*")
 
 # Global variables
 gas_detected = False
@@ -47,41 +82,243 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def run_blocking(func, *args):
+    """Run a blocking C call on eventlet's thread pool when the reactor
+    is active, so it can't stall every other client"""
+    if eventlet:
+        return eventlet.tpool.execute(func, *args)
+    return func(*args)
+
 class VoiceAlerts:
+    # libespeak-ng constants (speak_lib.h)
+    ESPEAK_AUDIO_OUTPUT_PLAYBACK = 0
+    ESPEAK_RATE = 1
+    ESPEAK_VOLUME = 2
+    ESPEAK_WORDGAP = 7
+    ESPEAK_CHARS_UTF8 = 1
+
+    SOUNDS_DIR = '/home/zero2w1/sounds'
+    # Sounds are copied here at startup so alerts play from RAM instead
+    # of hitting the SD card
+    SHM_SOUNDS_DIR = '/dev/shm/sounds'
+
+    # Fixed phrases spoken by this module - synthesized once at startup so
+    # the hot path just plays a cached WAV instead of running TTS
+    COMMON_MESSAGES = (
+        "There is an issue with the Gas Sensor",
+        "Voice alert system test",
+    )
+
     def __init__(self):
         self.enabled = os.environ.get('ENABLE_AUDIO', 'false').lower() == 'true'
         logger.info(f"Voice alerts {'enabled' if self.enabled else 'disabled'}")
-    
-    def play_sound_file(self, sound_name, repeat_count=1):
+
+        # Bind libespeak-ng once so each alert is a library call instead of
+        # an espeak-ng | aplay subprocess pipeline (two forks per repetition)
+        self._espeak = None
+        self._espeak_lock = threading.Lock()
+        self._prerendered = {}
+        # WAV params + raw PCM body per file, read once and replayed from RAM
+        self._wav_cache = {}
+        # All playback goes through one worker thread fed by this queue,
+        # instead of spawning a new thread per sound
+        self._queue = queue.Queue()
+        # Known sound name -> path, built once at startup
+        self.available = {}
+        if self.enabled:
+            self._init_espeak()
+            self._prerender_messages()
+            self.available = self._preload_sounds()
+            worker = threading.Thread(target=self._playback_worker, daemon=True)
+            worker.start()
+
+    def _playback_worker(self):
+        """Single audio worker - serializes all sound and voice playback"""
+        while True:
+            kind, payload, repeat_count = self._queue.get()
+            try:
+                if kind == 'file':
+                    self._play_wav_repeated(payload, repeat_count)
+                else:
+                    for i in range(repeat_count):
+                        logger.info(f"   Speaking repetition {i+1}/{repeat_count}")
+                        self._speak_once(payload)
+
+                        # Pause between repetitions (except last one)
+                        if i < repeat_count - 1:
+                            time.sleep(2)
+            except Exception as e:
+                logger.error(f"Audio playback failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _init_espeak(self):
+        """Load and configure libespeak-ng; fall back to subprocess on failure"""
+        try:
+            lib = ctypes.CDLL('libespeak-ng.so.1')
+            if lib.espeak_Initialize(self.ESPEAK_AUDIO_OUTPUT_PLAYBACK, 0, None, 0) < 0:
+                raise RuntimeError("espeak_Initialize failed")
+            lib.espeak_SetVoiceByName(b'hi')                       # Hindi voice
+            lib.espeak_SetParameter(self.ESPEAK_RATE, 120, 0)      # Speed (slower)
+            lib.espeak_SetParameter(self.ESPEAK_WORDGAP, 8, 0)     # Gap between words
+            lib.espeak_SetParameter(self.ESPEAK_VOLUME, 80, 0)     # Amplitude
+            self._espeak = lib
+            logger.info("libespeak-ng loaded for voice alerts")
+        except Exception as e:
+            logger.warning(f"libespeak-ng unavailable, using espeak-ng subprocess: {e}")
+
+    def _prerender_messages(self):
+        """Synthesize the fixed alert phrases to WAV files once at startup"""
+        for message in self.COMMON_MESSAGES:
+            msg_hash = hashlib.md5(message.encode('utf-8')).hexdigest()[:12]
+            wav_path = f"/tmp/alert_{msg_hash}.wav"
+            try:
+                if not os.path.exists(wav_path):
+                    subprocess.run(
+                        ['espeak-ng', '-v', 'hi', '-s', '120', '-g', '8',
+                         '-a', '80', '-w', wav_path, message],
+                        check=True, timeout=30
+                    )
+                self._prerendered[message] = wav_path
+            except Exception as e:
+                logger.warning(f"Could not pre-render voice message '{message}': {e}")
+
+    def _speak_once(self, message):
+        """Synthesize and play one utterance"""
+        # Pre-rendered phrase - just play the cached WAV, no TTS at all
+        wav_path = self._prerendered.get(message)
+        if wav_path:
+            subprocess.run(['aplay', '-q', wav_path], check=True)
+            return
+
+        if self._espeak:
+            text = message.encode('utf-8')
+            with self._espeak_lock:
+                # Synthesis blocks in C for the whole utterance - keep it
+                # off the reactor
+                run_blocking(self._synth_blocking, text)
+            return
+
+        # Fallback: pipe espeak-ng output to aplay
+        cmd = [
+            'espeak-ng',
+            '-v', 'hi',      # Hindi voice
+            '-s', '120',     # Speed (slower)
+            '-g', '8',       # Gap between words
+            '-a', '80',      # Amplitude
+            '--stdout',
+            message
+        ]
+        espeak_proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+        aplay_proc = subprocess.Popen(['aplay'], stdin=espeak_proc.stdout)
+        espeak_proc.stdout.close()
+        aplay_proc.wait()
+
+    def _synth_blocking(self, text):
+        """Blocking libespeak-ng synthesis + playback"""
+        self._espeak.espeak_Synth(text, len(text) + 1, 0, 0, 0,
+                                  self.ESPEAK_CHARS_UTF8, None, None)
+        self._espeak.espeak_Synchronize()
+
+    def _preload_sounds(self):
+        """Copy the known WAVs into tmpfs and memoize their paths"""
+        available = {}
+        try:
+            os.makedirs(self.SHM_SOUNDS_DIR, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not create tmpfs sound dir: {e}")
+
+        for src in glob.glob(os.path.join(self.SOUNDS_DIR, '*.wav')):
+            name = os.path.splitext(os.path.basename(src))[0]
+            dst = os.path.join(self.SHM_SOUNDS_DIR, os.path.basename(src))
+            try:
+                if not os.path.exists(dst):
+                    shutil.copyfile(src, dst)
+                available[name] = dst
+            except OSError as e:
+                logger.debug(f"Could not preload {src} into tmpfs: {e}")
+                available[name] = src
+
+        logger.info(f"Preloaded {len(available)} sound files")
+        return available
+
+    def _load_wav(self, sound_path):
+        """Read and cache a WAV file's params and raw PCM body"""
+        cached = self._wav_cache.get(sound_path)
+        if cached is None:
+            with wave.open(sound_path, 'rb') as wf:
+                params = wf.getparams()
+                body = wf.readframes(params.nframes)
+            cached = (params, body)
+            self._wav_cache[sound_path] = cached
+        return cached
+
+    @staticmethod
+    def _wait_proc(proc, timeout=None):
+        """Wait for a child via pidfd when available (no SIGCHLD races)"""
+        try:
+            pidfd = os.pidfd_open(proc.pid)
+        except (AttributeError, OSError):
+            proc.wait(timeout)
+            return
+        try:
+            select.select([pidfd], [], [], timeout)
+        finally:
+            os.close(pidfd)
+        proc.poll()
+
+    def _play_wav_repeated(self, sound_path, repeat_count, timeout=None):
+        """Play a cached WAV N times through a single aplay process"""
+        params, body = self._load_wav(sound_path)
+
+        if params.sampwidth != 2:
+            # Unusual format - let aplay parse the header itself
+            for i in range(repeat_count):
+                subprocess.run(['aplay', '-q', sound_path], check=True)
+                if i < repeat_count - 1:
+                    time.sleep(0.5)
+            return
+
+        # One aplay in raw mode for all repetitions; the pause between
+        # them is written as PCM silence, so no extra forks or sleeps
+        silence = b'\x00' * (int(0.5 * params.framerate) * params.nchannels * 2)
+        proc = subprocess.Popen(
+            ['aplay', '-q', '-t', 'raw', '-f', 'S16_LE',
+             '-r', str(params.framerate), '-c', str(params.nchannels), '-'],
+            stdin=subprocess.PIPE
+        )
+        for i in range(repeat_count):
+            proc.stdin.write(body)
+            if i < repeat_count - 1:
+                proc.stdin.write(silence)
+        proc.stdin.close()
+        self._wait_proc(proc, timeout)
+
+    def play_sound_file(self, sound_name, repeat_count=1, sync=False):
         """Play a sound file using aplay"""
         if not self.enabled:
             logger.info(f"Sound (disabled): {sound_name}")
             return
-            
-        sound_path = os.path.join('/home/zero2w1/sounds', f"{sound_name}.wav")
-        
-        if not os.path.exists(sound_path):
-            logger.error(f"Sound file not found: {sound_path}")
+
+        sound_path = self.available.get(sound_name)
+
+        if not sound_path:
+            logger.error(f"Sound file not found: {sound_name}")
             return
-            
+
         logger.info(f"🔊 Playing sound: {sound_name}")
-        
-        def play_thread():
+
+        if sync:
+            # Play inline and return when playback actually finishes
+            # (used during shutdown - no fixed sleep needed)
             try:
-                for i in range(repeat_count):
-                    logger.info(f"   Playing repetition {i+1}/{repeat_count}")
-                    subprocess.run(['aplay', '-q', sound_path], check=True)
-                    
-                    # Pause between repetitions (except last one)
-                    if i < repeat_count - 1:
-                        time.sleep(0.5)
-                        
+                self._play_wav_repeated(sound_path, repeat_count, timeout=5)
             except Exception as e:
                 logger.error(f"Sound playback failed: {e}")
-        
-        # Run in separate thread to avoid blocking
-        thread = threading.Thread(target=play_thread, daemon=True)
-        thread.start()
+            return
+
+        # Hand off to the playback worker to avoid blocking
+        self._queue.put(('file', sound_path, repeat_count))
     
     def speak_alert(self, message, repeat_count=3):
         """Speak message with Hindi voice, slower speed, and repetition"""
@@ -90,58 +327,96 @@ class VoiceAlerts:
             return
             
         logger.info(f"🔊 Voice alert: {message}")
-        
-        def speak_thread():
-            try:
-                for i in range(repeat_count):
-                    logger.info(f"   Speaking repetition {i+1}/{repeat_count}")
-                    
-                    # Use Hindi voice with slower speed and word gaps
-                    cmd = [
-                        'espeak-ng', 
-                        '-v', 'hi',      # Hindi voice
-                        '-s', '120',     # Speed (slower)
-                        '-g', '8',       # Gap between words
-                        '-a', '80',      # Amplitude
-                        '--stdout',
-                        message
-                    ]
-                    
-                    # Pipe to aplay for audio output
-                    espeak_proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
-                    aplay_proc = subprocess.Popen(['aplay'], stdin=espeak_proc.stdout)
-                    
-                    espeak_proc.stdout.close()
-                    aplay_proc.wait()
-                    
-                    # Pause between repetitions (except last one)
-                    if i < repeat_count - 1:
-                        time.sleep(2)
-                        
-            except Exception as e:
-                logger.error(f"Voice alert failed: {e}")
-        
-        # Run in separate thread to avoid blocking
-        thread = threading.Thread(target=speak_thread, daemon=True)
-        thread.start()
+
+        # Hand off to the playback worker to avoid blocking
+        self._queue.put(('tts', message, repeat_count))
 
 class SystemHealthMonitor:
+    # How long a full health check result stays valid before we re-run
+    # the subprocess probes (bluetoothctl/systemctl are expensive on a Pi)
+    HEALTH_CHECK_TTL = 30
+    BLUETOOTH_CHECK_TTL = 5
+
+    BT_DEVICE_MAC = 'FC:49:2D:4C:13:81'
+    BT_DEVICE_PATH = '/org/bluez/hci0/dev_' + BT_DEVICE_MAC.replace(':', '_')
+
     def __init__(self, voice_alerts):
         self.voice_alerts = voice_alerts
-        
-    def check_bluetooth_status(self):
-        """Check if Bluetooth is connected to target device"""
+        self._lock = threading.Lock()
+        self._cache = None
+        self._cache_ts = 0
+        self._bt_cache = None
+        self._bt_cache_ts = 0
+
+        # Connect to the system bus once; reused for every health check
+        self._bus = None
+        if pydbus:
+            try:
+                self._bus = pydbus.SystemBus()
+            except Exception as e:
+                logger.warning(f"D-Bus unavailable, falling back to CLI tools: {e}")
+
+        # systemd unit object path for ssh.service, resolved once on first use
+        self._ssh_unit_path = None
+
+    def _check_bluetooth_dbus(self):
+        """Read the device's Connected property directly from BlueZ"""
+        # Check the adapter is powered first - if the BT stack is down,
+        # this short-circuits instead of hanging on the device lookup
+        adapter = self._bus.get('org.bluez', '/org/bluez/hci0')
+        if not adapter.Powered:
+            return False
+        device = self._bus.get('org.bluez', self.BT_DEVICE_PATH)
+        return bool(device.Connected)
+
+    def _check_bluetooth_cli(self):
+        """Fallback: fork bluetoothctl (slow, only used without D-Bus)"""
         try:
             result = subprocess.run(
-                ['bluetoothctl', 'info', 'FC:49:2D:4C:13:81'],
+                ['bluetoothctl', 'info', self.BT_DEVICE_MAC],
                 capture_output=True, text=True, timeout=5
             )
             return 'Connected: yes' in result.stdout
         except:
             return False
+
+    def check_bluetooth_status(self):
+        """Check if Bluetooth is connected to target device (cached ~5s)"""
+        now = time.monotonic()
+        if self._bt_cache is not None and now - self._bt_cache_ts < self.BLUETOOTH_CHECK_TTL:
+            return self._bt_cache
+
+        if self._bus:
+            try:
+                connected = self._check_bluetooth_dbus()
+            except Exception:
+                # Adapter or device object missing (BT stack off / never paired)
+                connected = False
+        else:
+            connected = self._check_bluetooth_cli()
+
+        self._bt_cache = connected
+        self._bt_cache_ts = now
+        return connected
     
+    def _check_ssh_dbus(self):
+        """Read ssh.service ActiveState directly from systemd"""
+        if self._ssh_unit_path is None:
+            manager = self._bus.get('.systemd1')
+            self._ssh_unit_path = manager.LoadUnit('ssh.service')
+        unit = self._bus.get('.systemd1', self._ssh_unit_path)
+        return unit.ActiveState == 'active'
+
     def check_ssh_status(self):
         """Check if SSH service is running"""
+        if self._bus:
+            try:
+                return self._check_ssh_dbus()
+            except Exception:
+                # Stale unit path (e.g. daemon-reload) - re-resolve next time
+                self._ssh_unit_path = None
+                return False
+
         try:
             result = subprocess.run(
                 ['systemctl', 'is-active', 'ssh'],
@@ -159,12 +434,30 @@ class SystemHealthMonitor:
         except:
             return False
     
-    def perform_health_check(self):
-        """Perform comprehensive system health check"""
+    def get_cached_status(self):
+        """Return the last health snapshot written by the periodic thread"""
+        with self._lock:
+            if self._cache is not None:
+                return self._cache
+        # Nothing cached yet (e.g. first status request before the
+        # periodic thread has run) - do a real check
+        return self.perform_health_check()
+
+    def force_health_check(self):
+        """Run the probes now, bypassing the TTL cache"""
+        return self.perform_health_check(force=True)
+
+    def perform_health_check(self, force=False):
+        """Perform comprehensive system health check (cached for TTL seconds)"""
         global system_healthy, last_health_check
-        
+
+        with self._lock:
+            if (not force and self._cache is not None
+                    and time.monotonic() - self._cache_ts < self.HEALTH_CHECK_TTL):
+                return self._cache
+
         logger.info("🔍 Performing system health check...")
-        
+
         bluetooth_ok = self.check_bluetooth_status()
         ssh_ok = self.check_ssh_status()
         web_ok = self.check_web_service()
@@ -184,20 +477,37 @@ class SystemHealthMonitor:
         
         system_healthy = all_healthy
         last_health_check = datetime.now()
-        
-        return {
+
+        result = {
             'bluetooth': bluetooth_ok,
-            'ssh': ssh_ok, 
+            'ssh': ssh_ok,
             'web': web_ok,
             'overall': all_healthy,
             'timestamp': last_health_check.isoformat()
         }
 
+        with self._lock:
+            self._cache = result
+            self._cache_ts = time.monotonic()
+
+        return result
+
 class CameraManager:
+    # JPEG encode settings - quality 70 at 480p keeps encode time and
+    # bandwidth manageable on Pi-class hardware
+    FRAME_WIDTH = 640
+    FRAME_HEIGHT = 480
+    JPEG_QUALITY = 70
+
     def __init__(self):
         self.camera = None
         self.camera_available = False
         self.placeholder_mode = False
+        # Encoded placeholder image, built on first use - it never changes
+        self._placeholder_jpeg = None
+        self._placeholder_b64 = None
+        # True when the driver delivers raw MJPEG (CONVERT_RGB disabled)
+        self._raw_mjpeg = False
         self.initialize_camera()
     
     def initialize_camera(self):
@@ -219,6 +529,7 @@ class CameraManager:
                 try:
                     self.camera = cv2.VideoCapture(0)
                     if self.camera and self.camera.isOpened():
+                        self._configure_capture(self.camera)
                         # Test frame capture
                         ret, frame = self.camera.read()
                         if ret and frame is not None:
@@ -240,13 +551,16 @@ class CameraManager:
         except Exception as e:
             logger.error(f"Camera detection failed: {e}")
         
-        # Fallback - try USB cameras by scanning multiple indices
+        # Fallback - try USB cameras, but only on device nodes that exist
+        # and report capture capability (opening a dead index costs
+        # hundreds of ms of format negotiation per try)
         try:
             logger.info("Checking for USB cameras...")
-            for cam_index in range(5):  # Try indices 0-4
+            for cam_index in self._v4l2_capture_indices():
                 try:
                     test_camera = cv2.VideoCapture(cam_index)
                     if test_camera and test_camera.isOpened():
+                        self._configure_capture(test_camera)
                         ret, frame = test_camera.read()
                         if ret and frame is not None:
                             logger.info(f"✅ USB camera found at index {cam_index}")
@@ -265,7 +579,54 @@ class CameraManager:
         camera_available = False
         self.camera_available = False
         self.placeholder_mode = True
-        
+
+    @staticmethod
+    def _v4l2_capture_indices():
+        """Indices of /dev/video* nodes that report video capture capability"""
+        VIDIOC_QUERYCAP = 0x80685600
+        V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+        V4L2_CAP_DEVICE_CAPS = 0x80000000
+
+        indices = []
+        for path in glob.glob('/dev/video*'):
+            suffix = path.rsplit('video', 1)[1]
+            if not suffix.isdigit():
+                continue
+            try:
+                # struct v4l2_capability: capabilities at byte 84,
+                # per-node device_caps at 88
+                caps = bytearray(104)
+                with open(path, 'rb', buffering=0) as dev:
+                    fcntl.ioctl(dev, VIDIOC_QUERYCAP, caps)
+                cap_field = int.from_bytes(caps[84:88], 'little')
+                if cap_field & V4L2_CAP_DEVICE_CAPS:
+                    cap_field = int.from_bytes(caps[88:92], 'little')
+                if not cap_field & V4L2_CAP_VIDEO_CAPTURE:
+                    continue  # metadata/ISP node, not a camera
+            except OSError:
+                # Can't query (not V4L2?) - let OpenCV decide
+                pass
+            indices.append(int(suffix))
+        return sorted(indices)
+
+    def _configure_capture(self, cam):
+        """Ask V4L2 for MJPEG so frames arrive pre-compressed over USB"""
+        try:
+            cam.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+            cam.set(cv2.CAP_PROP_FRAME_WIDTH, self.FRAME_WIDTH)
+            cam.set(cv2.CAP_PROP_FRAME_HEIGHT, self.FRAME_HEIGHT)
+            # Keep the driver buffer small so slow clients don't read stale frames
+            cam.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+            # If the driver really switched to MJPG, skip the decode to BGR
+            # entirely - frames then arrive as ready-to-serve JPEG bytes
+            self._raw_mjpeg = False
+            if int(cam.get(cv2.CAP_PROP_FOURCC)) == cv2.VideoWriter_fourcc(*'MJPG'):
+                cam.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+                self._raw_mjpeg = True
+        except Exception as e:
+            logger.debug(f"Could not set MJPG format: {e}")
+
     def generate_placeholder_frame(self):
         """Generate a placeholder image when no camera is available"""
         import numpy as np
@@ -289,35 +650,93 @@ class CameraManager:
             cv2.putText(placeholder, text, pos, font, scale, color, thickness, cv2.LINE_AA)
         
         return placeholder
-        
-    def get_frame(self):
-        """Get camera frame as base64 encoded string"""
-        frame = None
-        
-        # Try to get real camera frame
+
+    def _get_placeholder_jpeg(self):
+        """Return the placeholder as JPEG bytes, encoding it only once"""
+        if self._placeholder_jpeg is None:
+            frame = self.generate_placeholder_frame()
+            _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+            self._placeholder_jpeg = buffer.tobytes()
+        return self._placeholder_jpeg
+
+
+    def _capture_frame(self):
+        """Capture a frame from the camera, or None if unavailable"""
         if self.camera_available and self.camera:
             try:
-                ret, frame = self.camera.read()
-                if not ret or frame is None:
-                    logger.warning("Failed to capture frame from camera")
-                    self.placeholder_mode = True
+                # Advance past any buffered frames without decoding them,
+                # then decode only the most recent one. Clients polling
+                # slower than the capture rate otherwise see stale frames.
+                buffered = int(self.camera.get(cv2.CAP_PROP_BUFFERSIZE) or 1)
+                grabbed = False
+                for _ in range(max(buffered, 1)):
+                    grabbed = self.camera.grab() or grabbed
+                if grabbed:
+                    ret, frame = self.camera.retrieve()
+                    if ret and frame is not None:
+                        return frame
+                logger.warning("Failed to capture frame from camera")
+                self.placeholder_mode = True
             except Exception as e:
                 logger.error(f"Frame capture error: {e}")
                 self.placeholder_mode = True
-        
-        # Use placeholder if no camera or capture failed
+        return None
+
+    def get_jpeg_frame(self):
+        """Get current frame as JPEG-encoded bytes"""
+        frame = self._capture_frame()
+
+        # Use cached placeholder if no camera or capture failed
         if frame is None or self.placeholder_mode:
-            frame = self.generate_placeholder_frame()
-        
+            return self._get_placeholder_jpeg()
+
+        # Raw MJPEG from the driver (CONVERT_RGB off) - already JPEG bytes,
+        # delivered as a 1xN buffer rather than an H x W x 3 image
+        if self._raw_mjpeg and frame.ndim < 3:
+            return memoryview(frame.reshape(-1))
+
         try:
-            # Encode frame as JPEG
-            _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-            frame_data = base64.b64encode(buffer).decode('utf-8')
-            return f"data:image/jpeg;base64,{frame_data}"
+            _, buffer = cv2.imencode('.jpg', frame,
+                                     [cv2.IMWRITE_JPEG_QUALITY, self.JPEG_QUALITY])
+            # View over the encoder's output buffer - no bytes copy
+            return memoryview(buffer)
         except Exception as e:
             logger.error(f"Frame encoding error: {e}")
             return None
-    
+
+    def get_frame(self):
+        """Get camera frame as base64 encoded string (placeholder fallback)"""
+        jpeg = self.get_jpeg_frame()
+        if jpeg is None:
+            return None
+        if jpeg is self._placeholder_jpeg:
+            if self._placeholder_b64 is None:
+                self._placeholder_b64 = ("data:image/jpeg;base64,"
+                                         + base64.b64encode(jpeg).decode('utf-8'))
+            return self._placeholder_b64
+        return "data:image/jpeg;base64," + base64.b64encode(jpeg).decode('utf-8')
+
+    # Constant multipart framing, built once - each frame only yields
+    # views/constants instead of concatenating a new bytes object
+    MJPEG_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+    MJPEG_PART_TRAILER = b'\r\n'
+
+    def generate_mjpeg(self):
+        """Yield raw multipart JPEG parts for the /video_feed stream"""
+        while self.camera_available and not self.placeholder_mode:
+            # Capture and encode are blocking C calls - run them on the
+            # tpool so one open stream can't stall the reactor
+            jpeg = run_blocking(self.get_jpeg_frame)
+            if jpeg is None or self.placeholder_mode:
+                # Camera died mid-stream - end the stream rather than
+                # busy-looping the placeholder at full speed; clients get
+                # the placeholder from /api/camera-feed instead
+                break
+            yield self.MJPEG_PART_HEADER
+            yield jpeg
+            yield self.MJPEG_PART_TRAILER
+
+
     def cleanup(self):
         """Cleanup camera resources"""
         if self.camera:
@@ -325,6 +744,11 @@ class CameraManager:
 
 
 class GasSensorMonitor:
+    # Rapid sensor edges collapse into at most one broadcast per window
+    EMIT_COALESCE_WINDOW = 0.1
+    # How often the reactor-side dispatcher checks for flagged GPIO edges
+    GPIO_DISPATCH_INTERVAL = 0.05
+
     def __init__(self):
         self.voice_alerts = VoiceAlerts()
         self.health_monitor = SystemHealthMonitor(self.voice_alerts)
@@ -332,7 +756,16 @@ class GasSensorMonitor:
         self.running = True
         self.gas_count = 0
         self.last_detection = None
-        
+        # Set by the rising-edge callback when the sensor output clears,
+        # so the alert loop wakes immediately instead of polling
+        self.clear_event = threading.Event()
+        # Plain flag written by the GPIO callback thread; polled by the
+        # reactor-side dispatcher (plain attribute writes are the only
+        # thing safe to do from RPi.GPIO's unpatched pthread)
+        self._edge_pending = False
+        self._emit_pending = False
+        self._emit_lock = threading.Lock()
+
         # GPIO setup
         GPIO.setmode(GPIO.BCM)
 
@@ -342,8 +775,8 @@ class GasSensorMonitor:
         except:
             pass
         GPIO.setup(GAS_SENSOR_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-        GPIO.add_event_detect(GAS_SENSOR_PIN, GPIO.FALLING, 
-                            callback=self.gas_detected_callback, 
+        GPIO.add_event_detect(GAS_SENSOR_PIN, GPIO.BOTH,
+                            callback=self.gas_edge_callback,
                             bouncetime=int(DEBOUNCE_TIME * 1000))
         
         logger.info("Gas sensor initialized successfully on GPIO17")
@@ -354,22 +787,70 @@ class GasSensorMonitor:
         # Start health monitoring thread
         self.health_thread = threading.Thread(target=self.periodic_health_check, daemon=True)
         self.health_thread.start()
+
+        # Bridge GPIO's raw callback threads onto the reactor - see
+        # _gpio_dispatcher
+        socketio.start_background_task(self._gpio_dispatcher)
         
     def periodic_health_check(self):
         """Periodic system health checks"""
         while self.running:
             try:
-                self.health_monitor.perform_health_check()
+                self.health_monitor.force_health_check()
                 time.sleep(60)  # Check every minute
             except Exception as e:
                 logger.error(f"Health check error: {e}")
                 time.sleep(60)
     
+    def _schedule_state_broadcast(self):
+        """Coalesce rapid edge events into a single delayed broadcast"""
+        with self._emit_lock:
+            if self._emit_pending:
+                return
+            self._emit_pending = True
+        socketio.start_background_task(self._broadcast_state)
+
+    def _broadcast_state(self):
+        """Emit the latest gas state after the coalescing window"""
+        socketio.sleep(self.EMIT_COALESCE_WINDOW)
+        with self._emit_lock:
+            self._emit_pending = False
+
+        event = 'gas_detected' if gas_detected else 'gas_cleared'
+        socketio.emit(event, {
+            'detected': gas_detected,
+            'count': self.gas_count,
+            'timestamp': datetime.now().isoformat()
+        })
+
+    def gas_edge_callback(self, channel):
+        """GPIO edge callback - runs on RPi.GPIO's own (unpatched) pthread.
+
+        eventlet's hub never runs on that thread, so greenlets spawned
+        here would never be scheduled; just flag the edge and let the
+        reactor-side dispatcher do the work."""
+        self._edge_pending = True
+
+    def _gpio_dispatcher(self):
+        """Reactor-side handler for GPIO edges flagged by the callback"""
+        while self.running:
+            socketio.sleep(self.GPIO_DISPATCH_INTERVAL)
+            if not self._edge_pending:
+                continue
+            self._edge_pending = False
+
+            if GPIO.input(GAS_SENSOR_PIN) == GPIO.LOW:
+                self.gas_detected_callback(GAS_SENSOR_PIN)
+            else:
+                # Sensor output released - wake the alert loop
+                self.clear_event.set()
+
     def gas_detected_callback(self, channel):
-        """GPIO callback for gas detection"""
+        """Handle a falling edge (gas detected); runs on the reactor"""
         global gas_detected, alert_active
-        
+
         if not alert_active:
+            self.clear_event.clear()
             self.gas_count += 1
             self.last_detection = datetime.now()
             gas_detected = True
@@ -384,12 +865,8 @@ class GasSensorMonitor:
             alert_thread = threading.Thread(target=self.continuous_gas_alert, daemon=True)
             alert_thread.start()
             
-            # Notify web clients
-            socketio.emit('gas_detected', {
-                'detected': True,
-                'count': self.gas_count,
-                'timestamp': self.last_detection.isoformat()
-            })
+            # Notify web clients (coalesced)
+            self._schedule_state_broadcast()
     
     def continuous_gas_alert(self):
         """Continuous alert while gas is detected"""
@@ -398,28 +875,29 @@ class GasSensorMonitor:
         logger.info("Started continuous gas alert")
         
         while alert_active and self.running:
-            time.sleep(ALERT_REPEAT_INTERVAL)
-            
+            # The event is only a wakeup hint - a spurious rising edge
+            # (comparator glitch, EMI) must never silence the alarm, so
+            # only the actual pin state decides below
+            self.clear_event.wait(ALERT_REPEAT_INTERVAL)
+
             if alert_active:
-                # Check if gas is still detected
                 if GPIO.input(GAS_SENSOR_PIN) == GPIO.HIGH:
                     # Gas cleared
                     gas_detected = False
                     alert_active = False
                     logger.info("✅ Gas levels normalized")
-                    
+
                     # Clear alert voice message
                     self.voice_alerts.play_sound_file("air-clear", 1)
-                    
-                    socketio.emit('gas_cleared', {
-                        'detected': False,
-                        'timestamp': datetime.now().isoformat()
-                    })
+
+                    self._schedule_state_broadcast()
                     break
                 else:
-                    # Gas still detected - repeat alert
+                    # Gas still detected - the wake was a timeout or a
+                    # spurious edge; re-arm the event and repeat the alert
+                    self.clear_event.clear()
                     logger.warning("🚨 Gas still detected - repeating alert")
-            self.voice_alerts.play_sound_file("11labs_gas_alert_v2", 1)
+                    self.voice_alerts.play_sound_file("11labs_gas_alert_v2", 1)
     
     def get_status(self):
         """Get current sensor status"""
@@ -430,15 +908,14 @@ class GasSensorMonitor:
             'last_detection': self.last_detection.isoformat() if self.last_detection else None,
             'gpio_state': GPIO.input(GAS_SENSOR_PIN),
             'camera_available': self.camera_manager.camera_available,
-            'system_health': self.health_monitor.perform_health_check()
+            'system_health': self.health_monitor.get_cached_status()
         }
     
     def cleanup(self):
         """Cleanup GPIO and resources"""
-        # Play shutdown sound
-        self.voice_alerts.play_sound_file("shutdown-gas-leak", 1)
-        time.sleep(2)  # Wait for sound to play
-        
+        # Play shutdown sound and wait only as long as playback takes
+        self.voice_alerts.play_sound_file("shutdown-gas-leak", 1, sync=True)
+
         self.running = False
         self.camera_manager.cleanup()
         try:
@@ -450,6 +927,12 @@ class GasSensorMonitor:
 # Global sensor monitor instance
 sensor_monitor = None
 
+def fast_jsonify(data):
+    """Serialize a JSON response with orjson when available"""
+    if orjson is None:
+        return jsonify(data)
+    return Response(orjson.dumps(data), mimetype='application/json')
+
 # Flask routes
 @app.route('/')
 def index():
@@ -460,8 +943,16 @@ def index():
 def get_status():
     """Get current status"""
     if sensor_monitor:
-        return jsonify(sensor_monitor.get_status())
-    return jsonify({'error': 'Sensor not initialized'})
+        return fast_jsonify(sensor_monitor.get_status())
+    return fast_jsonify({'error': 'Sensor not initialized'})
+
+@app.route('/video_feed')
+def video_feed():
+    """Live MJPEG camera stream (no base64/JSON overhead)"""
+    if sensor_monitor and sensor_monitor.camera_manager.camera_available:
+        return Response(sensor_monitor.camera_manager.generate_mjpeg(),
+                        mimetype='multipart/x-mixed-replace; boundary=frame')
+    return jsonify({'error': 'Camera not available'}), 503
 
 @app.route('/api/camera-feed')
 def camera_feed():
@@ -485,8 +976,8 @@ def test_voice():
 def health_check():
     """Manual system health check"""
     if sensor_monitor:
-        health_status = sensor_monitor.health_monitor.perform_health_check()
-        return jsonify(health_status)
+        health_status = sensor_monitor.health_monitor.force_health_check()
+        return fast_jsonify(health_status)
     return jsonify({'error': 'Sensor not initialized'})
 
 @socketio.on('connect')
@@ -503,13 +994,9 @@ def handle_disconnect():
 
 def signal_handler(signum, frame):
     """Handle shutdown signals"""
-    global sensor_monitor
-    
     logger.info("Shutdown signal received")
-    if sensor_monitor and sensor_monitor.voice_alerts:
-        sensor_monitor.voice_alerts.play_sound_file("shutdown-gas-leak", 1)
-        time.sleep(2)  # Wait for sound to play
     if sensor_monitor:
+        # cleanup() plays the shutdown sound synchronously
         sensor_monitor.cleanup()
     sys.exit(0)
 
@@ -537,7 +1024,11 @@ def main():
         
         # Start Flask app
         logger.info("Starting web interface on http://0.0.0.0:5000")
-        socketio.run(app, host='0.0.0.0', port=5000, debug=False, allow_unsafe_werkzeug=True)
+        if eventlet:
+            eventlet.wsgi.server(eventlet.listen(('0.0.0.0', 5000)), app)
+        else:
+            socketio.run(app, host='0.0.0.0', port=5000, debug=False,
+                         allow_unsafe_werkzeug=True)
         
     except Exception as e:
         logger.error(f"Application error: {e}")
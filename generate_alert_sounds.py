@@ -2,6 +2,7 @@
 """
 Generate alert sound files for gas detection
 """
+import itertools
 import numpy as np
 import wave
 import struct
@@ -9,42 +10,38 @@ import struct
 def generate_beep(frequency=800, duration=1.0, volume=0.7, sample_rate=44100):
     """Generate a beep sound"""
     frames = int(duration * sample_rate)
-    wavedata = []
-    
-    for i in range(frames):
-        # Generate sine wave
-        value = volume * np.sin(frequency * 2 * np.pi * i / sample_rate)
-        # Convert to 16-bit PCM and clamp
-        data = max(-32767, min(32767, int(value * 32767)))
-        wavedata.append([data, data])  # stereo
-    
-    return wavedata
+    t = np.arange(frames) / sample_rate
+
+    # Generate sine wave as one vectorized expression
+    value = volume * np.sin(frequency * 2 * np.pi * t)
+
+    # Convert to 16-bit PCM and clamp
+    samples = np.clip(value * 32767, -32767, 32767).astype('<i2')
+    return np.repeat(samples[:, None], 2, axis=1)  # stereo
 
 def generate_urgent_alarm(duration=2.0, sample_rate=44100):
     """Generate urgent alternating alarm sound"""
     frames = int(duration * sample_rate)
-    wavedata = []
-    
+    t = np.arange(frames) / sample_rate
+
     # Alternating frequencies for urgent sound
     freq1, freq2 = 1000, 800
     switch_rate = 0.2  # switch every 0.2 seconds
-    
-    for i in range(frames):
-        time = i / sample_rate
-        # Switch frequency based on time
-        frequency = freq1 if (time % (switch_rate * 2)) < switch_rate else freq2
-        
-        # Generate sine wave with some modulation
-        value = 0.6 * np.sin(frequency * 2 * np.pi * time)  # Reduced volume
-        # Add slight tremolo effect
-        tremolo = 1 + 0.2 * np.sin(8 * 2 * np.pi * time)  # Reduced tremolo
-        value *= tremolo
-        
-        # Convert to 16-bit PCM and clamp
-        data = max(-32767, min(32767, int(value * 16000)))  # Reduced amplitude
-        wavedata.append([data, data])  # stereo
-    
-    return wavedata
+
+    # Switch frequency based on time; integrate phase so the
+    # switches don't produce clicks
+    frequency = np.where((t % (switch_rate * 2)) < switch_rate, freq1, freq2)
+    phase = np.cumsum(frequency * 2 * np.pi / sample_rate)
+
+    # Generate sine wave with some modulation
+    value = 0.6 * np.sin(phase)  # Reduced volume
+    # Add slight tremolo effect
+    tremolo = 1 + 0.2 * np.sin(8 * 2 * np.pi * t)  # Reduced tremolo
+    value *= tremolo
+
+    # Convert to 16-bit PCM and clamp
+    samples = np.clip(value * 16000, -32767, 32767).astype('<i2')  # Reduced amplitude
+    return np.repeat(samples[:, None], 2, axis=1)  # stereo
 
 def save_wav(filename, wavedata, sample_rate=44100):
     """Save wave data to file"""
@@ -53,9 +50,14 @@ def save_wav(filename, wavedata, sample_rate=44100):
         wav_file.setnchannels(2)
         wav_file.setsampwidth(2)
         wav_file.setframerate(sample_rate)
-        
-        for frame in wavedata:
-            wav_file.writeframes(struct.pack('<hh', frame[0], frame[1]))
+
+        # One contiguous buffer and a single writeframes call - per-frame
+        # writes re-validate header state and cost one syscall each
+        if isinstance(wavedata, np.ndarray):
+            wav_file.writeframes(wavedata.astype('<i2', copy=False).tobytes())
+        else:
+            flat = list(itertools.chain.from_iterable(wavedata))
+            wav_file.writeframes(struct.pack(f'<{len(flat)}h', *flat))
 
 def main():
     print("Generating alert sound files...")